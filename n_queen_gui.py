@@ -1,10 +1,13 @@
 import sys
 import random
 import time
+from collections import defaultdict
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QPushButton, QSpinBox, QLabel, QSlider)
-from PySide6.QtCore import Qt, QTimer, QPoint, Signal, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QPainter, QColor, QFont, QDrag, QPixmap, QPainterPath
+from PySide6.QtCore import Qt, QObject, QThread, QTimer, QPoint, QRect, Signal, Slot, QPropertyAnimation, QEasingCurve
+from PySide6.QtGui import QPainter, QColor, QBrush, QFont, QDrag, QPixmap, QPainterPath
+
+from solver_core import first_solution, search_steps
 
 
 class ChessBoard(QWidget):
@@ -17,25 +20,49 @@ class ChessBoard(QWidget):
     def __init__(self, n=8):
         super().__init__()
         self.n = n
-        self.queens = []  # List of (row, col) tuples
+        self.queens = []  # List of (row, col) tuples, in placement order
+        self._queen_set = set()  # Same positions, for O(1) lookups
         self.dragging_queen = None
         self.drag_start_pos = None
         self.drag_current_pos = None
+        self._last_drag_rect = QRect()  # Area last painted by the dragged queen
+        self._last_drag_pos = QPoint()  # Mouse position it was last painted at
+        # Coalesces drag repaints to at most one per display frame (~60Hz)
+        self._drag_repaint_timer = QTimer(self)
+        self._drag_repaint_timer.setSingleShot(True)
+        self._drag_repaint_timer.setInterval(16)
+        self._drag_repaint_timer.setTimerType(Qt.CoarseTimer)
+        self._drag_repaint_timer.timeout.connect(self.flushDragRepaint)
         self.attacking_pairs = []  # List of pairs of attacking queens
         self.guides_enabled = False
+        self._threat_masks = []  # Threat bitmask of every square, see buildThreatMasks
+        self._board_brush = None  # Pre-rendered checkered tile, see paintEvent
+        self._bg_key = None
+        self._queen_pix = None  # Pre-rendered queen glyphs, see paintEvent
+        self._queen_pix_faded = None
         self.setMinimumSize(500, 500)
         self.setMouseTracking(True)
+        self.updateBoardGeometry()
+        self.buildThreatMasks()
         
     def setN(self, n):
         """Update board size"""
         self.n = n
         self.queens = []
+        self._queen_set = set()
         self.attacking_pairs = []
+        self._bg_key = None
+        self.updateBoardGeometry()
+        self.buildThreatMasks()
         self.update()
         
     def placeQueen(self, row, col):
         """Place a queen at the given position"""
-        if (row, col) not in self.queens:
+        # Squares outside the board have no entry in the geometry/threat tables
+        if not (0 <= row < self.n and 0 <= col < self.n):
+            return
+        if (row, col) not in self._queen_set:
+            self._queen_set.add((row, col))
             self.queens.append((row, col))
             self.detectAttacks()
             self.update()
@@ -43,7 +70,8 @@ class ChessBoard(QWidget):
             
     def removeQueen(self, row, col):
         """Remove queen from position"""
-        if (row, col) in self.queens:
+        if (row, col) in self._queen_set:
+            self._queen_set.discard((row, col))
             self.queens.remove((row, col))
             self.detectAttacks()
             self.update()
@@ -52,33 +80,48 @@ class ChessBoard(QWidget):
     def clearQueens(self):
         """Clear all queens"""
         self.queens = []
+        self._queen_set = set()
         self.attacking_pairs = []
         self.update()
         self.boardChanged.emit()
         
+    def setQueens(self, queens):
+        """Replace all queens at once, detecting attacks and repainting only once"""
+        # Drop duplicates and off-board squares, keep order
+        self.queens = [(r, c) for r, c in dict.fromkeys(queens)
+                       if 0 <= r < self.n and 0 <= c < self.n]
+        self._queen_set = set(self.queens)
+        self.detectAttacks()
+        self.update()
+        self.boardChanged.emit()
+        
     def randomPlaceQueens(self, count=None):
         """Randomly place queens on the board"""
-        self.clearQueens()
         if count is None:
             count = self.n
-        positions = [(r, c) for r in range(self.n) for c in range(self.n)]
-        random.shuffle(positions)
-        for i in range(min(count, len(positions))):
-            self.placeQueen(positions[i][0], positions[i][1])
+        # Sample square indices instead of building and shuffling every position
+        picks = random.sample(range(self.n * self.n), min(count, self.n * self.n))
+        self.setQueens([divmod(p, self.n) for p in picks])
             
     def detectAttacks(self):
         """Detect all pairs of attacking queens"""
         self.attacking_pairs = []
-        queens_list = list(self.queens)
         
-        for i in range(len(queens_list)):
-            for j in range(i + 1, len(queens_list)):
-                q1 = queens_list[i]
-                q2 = queens_list[j]
-                
-                # Check if queens attack each other
-                if self.areAttacking(q1, q2):
-                    self.attacking_pairs.append((q1, q2))
+        # Bucket queens by row, column and both diagonals; only queens sharing
+        # a bucket can attack each other, and two distinct squares share at most one
+        buckets = [defaultdict(list) for _ in range(4)]
+        for queen in self.queens:
+            r, c = queen
+            buckets[0][r].append(queen)
+            buckets[1][c].append(queen)
+            buckets[2][r + c].append(queen)
+            buckets[3][r - c].append(queen)
+            
+        for bucket in buckets:
+            for line in bucket.values():
+                for i in range(len(line)):
+                    for j in range(i + 1, len(line)):
+                        self.attacking_pairs.append((line[i], line[j]))
                     
     def setGuidesEnabled(self, enabled):
         """Toggle guide highlights (possible-move shading)"""
@@ -87,19 +130,39 @@ class ChessBoard(QWidget):
         
     def getThreatenedSquares(self, queen):
         """Get all squares a queen can attack (row, col, diagonals)"""
-        r, c = queen
+        mask = self.getThreatMask(queen)
         squares = set()
+        while mask:
+            bit = mask & -mask
+            squares.add(divmod(bit.bit_length() - 1, self.n))
+            mask ^= bit
+        return squares
+        
+    def getThreatMask(self, queen):
+        """Get the squares a queen can attack as a bitmask, bit row * n + col"""
+        r, c = queen
+        return self._threat_masks[r * self.n + c]
+        
+    def buildThreatMasks(self):
+        """Precompute the threat bitmask of every square for the current N"""
+        # Only depends on the square and N, so a table lookup replaces per-paint work
+        self._threat_masks = [self.computeThreatMask((r, c))
+                              for r in range(self.n) for c in range(self.n)]
+        
+    def computeThreatMask(self, queen):
+        """Build the bitmask of squares a queen attacks"""
+        r, c = queen
+        mask = 0
         for i in range(self.n):
-            squares.add((i, c))  # Same column
-        for j in range(self.n):
-            squares.add((r, j))  # Same row
+            mask |= 1 << (i * self.n + c)  # Same column
+            mask |= 1 << (r * self.n + i)  # Same row
         for k in range(1, self.n):
             for dr, dc in [(k, k), (k, -k), (-k, k), (-k, -k)]:
                 nr, nc = r + dr, c + dc
                 if 0 <= nr < self.n and 0 <= nc < self.n:
-                    squares.add((nr, nc))
-        squares.discard((r, c))  # Exclude queen's own square
-        return squares
+                    mask |= 1 << (nr * self.n + nc)
+        mask &= ~(1 << (r * self.n + c))  # Exclude queen's own square
+        return mask
         
     def areAttacking(self, q1, q2):
         """Check if two queens attack each other"""
@@ -120,35 +183,54 @@ class ChessBoard(QWidget):
         
     def getSquareAt(self, pos):
         """Get board square coordinates from mouse position"""
-        size = min(self.width(), self.height())
-        square_size = size / self.n
-        margin_x = (self.width() - size) / 2
-        margin_y = (self.height() - size) / 2
-        
-        col = int((pos.x() - margin_x) / square_size)
-        row = int((pos.y() - margin_y) / square_size)
+        # Floor division, so points just left of or above the board give -1
+        # rather than truncating towards zero into the first column/row
+        col = (pos.x() - self._xs[0]) // self._sq
+        row = (pos.y() - self._ys[0]) // self._sq
         
         if 0 <= row < self.n and 0 <= col < self.n:
             return row, col
         return None
         
+    def getDragRect(self, pos):
+        """Get the area covered by the dragged queen drawn centered on pos"""
+        half = self._sq // 2 + 1
+        return QRect(pos.x() - half, pos.y() - half, 2 * half + 1, 2 * half + 1)
+        
     def mousePressEvent(self, event):
         """Handle mouse press for dragging queens"""
         if event.button() == Qt.LeftButton:
             square = self.getSquareAt(event.position().toPoint())
             if square:
                 row, col = square
-                if (row, col) in self.queens:
+                if (row, col) in self._queen_set:
                     self.dragging_queen = (row, col)
                     self.drag_start_pos = event.position().toPoint()
                     self.drag_current_pos = event.position().toPoint()
+                    self._last_drag_rect = self.getDragRect(self.drag_current_pos)
+                    self._last_drag_pos = self.drag_current_pos
+                    self.update()  # Redraw with the picked-up queen faded
                     
     def mouseMoveEvent(self, event):
         """Handle mouse move for dragging"""
         if self.dragging_queen and event.buttons() & Qt.LeftButton:
             self.drag_current_pos = event.position().toPoint()
-            self.update()  # Redraw with drag preview
-            
+            # A 1px wobble doesn't visibly move the preview, so don't repaint for it
+            if (self.drag_current_pos - self._last_drag_pos).manhattanLength() < 2:
+                return
+            if not self._drag_repaint_timer.isActive():
+                self._drag_repaint_timer.start()
+                
+    def flushDragRepaint(self):
+        """Repaint the drag preview at the latest mouse position"""
+        if not self.dragging_queen:
+            return  # Dropped in the meantime, mouseReleaseEvent repainted
+        # Only repaint where the drag preview was and where it is now
+        new_rect = self.getDragRect(self.drag_current_pos)
+        self.update(self._last_drag_rect.united(new_rect))
+        self._last_drag_rect = new_rect
+        self._last_drag_pos = self.drag_current_pos
+        
     def mouseReleaseEvent(self, event):
         """Handle mouse release to drop queen"""
         if self.dragging_queen and event.button() == Qt.LeftButton:
@@ -157,10 +239,11 @@ class ChessBoard(QWidget):
                 new_row, new_col = square
                 old_row, old_col = self.dragging_queen
                 
-                # Remove from old position and place at new position
+                # Remove from old position and place at new position, as one
+                # update so attacks are detected and the board repainted once
                 if (new_row, new_col) != (old_row, old_col):
-                    self.removeQueen(old_row, old_col)
-                    self.placeQueen(new_row, new_col)
+                    queens = [q for q in self.queens if q != (old_row, old_col)]
+                    self.setQueens(queens + [(new_row, new_col)])
             else:
                 # Dropped outside board, remove queen
                 self.removeQueen(*self.dragging_queen)
@@ -170,31 +253,75 @@ class ChessBoard(QWidget):
             self.drag_current_pos = None
             self.update()
             
-    def paintEvent(self, event):
-        """Draw the chessboard and queens"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        size = min(self.width(), self.height())
-        square_size = size / self.n
-        margin_x = (self.width() - size) / 2
-        margin_y = (self.height() - size) / 2
+    def renderBoardBrush(self):
+        """Render a 2x2-square tile of the checkered board as a texture brush"""
+        sq = self._sq
+        tile = QPixmap(2 * sq, 2 * sq)
+        tile_painter = QPainter(tile)
         
         # Wooden color (light brown/tan)
         wooden_color = QColor(210, 180, 140)  # Tan color
         white_color = QColor(255, 255, 255)
         
-        # Draw board squares
-        for row in range(self.n):
-            for col in range(self.n):
-                x = margin_x + col * square_size
-                y = margin_y + row * square_size
-                
-                # Alternate colors
-                if (row + col) % 2 == 0:
-                    painter.fillRect(int(x), int(y), int(square_size), int(square_size), white_color)
-                else:
-                    painter.fillRect(int(x), int(y), int(square_size), int(square_size), wooden_color)
+        tile_painter.fillRect(0, 0, sq, sq, white_color)
+        tile_painter.fillRect(sq, sq, sq, sq, white_color)
+        tile_painter.fillRect(sq, 0, sq, sq, wooden_color)
+        tile_painter.fillRect(0, sq, sq, sq, wooden_color)
+        tile_painter.end()
+        return QBrush(tile)
+        
+    def renderQueen(self, color):
+        """Render the queen glyph into a transparent square-sized pixmap"""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self._sq * dpr), int(self._sq * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        queen_painter = QPainter(pixmap)
+        queen_painter.setRenderHint(QPainter.Antialiasing)
+        queen_painter.setFont(self._queen_font)
+        queen_painter.setPen(color)
+        queen_painter.drawText(0, 0, self._sq, self._sq, Qt.AlignCenter, "♛")
+        queen_painter.end()
+        return pixmap
+        
+    def updateBoardGeometry(self):
+        """Cache square positions and the queen font for the current size and N"""
+        # Whole-pixel squares, so every square is the same size and the board
+        # can be filled by tiling one pre-rendered pattern
+        sq = min(self.width(), self.height()) // self.n
+        margin_x = (self.width() - sq * self.n) // 2
+        margin_y = (self.height() - sq * self.n) // 2
+        
+        # Pixel position of each column and row, computed once here instead of on every paint
+        self._xs = [margin_x + col * sq for col in range(self.n)]
+        self._ys = [margin_y + row * sq for row in range(self.n)]
+        self._sq = sq
+        self._queen_font = QFont("Arial", int(sq * 0.6))
+        
+    def resizeEvent(self, event):
+        """Recompute the board geometry and drop the cached background on resize"""
+        self._bg_key = None
+        self.updateBoardGeometry()
+        super().resizeEvent(event)
+        
+    def paintEvent(self, event):
+        """Draw the chessboard and queens"""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        xs, ys, sq = self._xs, self._ys, self._sq
+        
+        # The board pattern and the queen glyph only change on resize or N change,
+        # so reuse cached copies
+        key = (self.width(), self.height(), self.n, self.devicePixelRatioF())
+        if key != self._bg_key:
+            self._board_brush = self.renderBoardBrush()
+            self._queen_pix = self.renderQueen(QColor(0, 0, 0))  # Black outline
+            self._queen_pix_faded = self.renderQueen(QColor(0, 0, 0, 100))
+            self._bg_key = key
+            
+        # Fill the whole board in one call, tiling the pattern from its top-left corner
+        painter.setBrushOrigin(xs[0], ys[0])
+        painter.fillRect(xs[0], ys[0], sq * self.n, sq * self.n, self._board_brush)
         
         # Guides mode: shade possible-move squares for each queen (different color per queen)
         # Clash mode: highlight attacking pairs (mutually exclusive with guides)
@@ -211,65 +338,85 @@ class ChessBoard(QWidget):
                 QColor(180, 255, 255, 150),  # Light cyan
                 QColor(255, 255, 180, 150),  # Light yellow
             ]
-            # Track which square is shaded by which queen (last queen wins for overlaps)
-            square_color = {}
-            for idx, queen in enumerate(self.queens):
-                color = guide_colors[idx % len(guide_colors)]
-                for sq in self.getThreatenedSquares(queen):
-                    square_color[sq] = color
-            for (row, col), color in square_color.items():
-                x = margin_x + col * square_size
-                y = margin_y + row * square_size
-                painter.fillRect(int(x), int(y), int(square_size), int(square_size), color)
+            # Last queen wins for overlaps: walk queens from last to first and skip
+            # squares already claimed, so each square is shaded exactly once.
+            # Squares are grouped by color so each color is one drawRects call.
+            color_rects = [[] for _ in guide_colors]
+            painted = 0  # Bit row * n + col set for every square already claimed
+            for idx in range(len(self.queens) - 1, -1, -1):
+                rects = color_rects[idx % len(guide_colors)]
+                mask = self.getThreatMask(self.queens[idx]) & ~painted
+                painted |= mask
+                while mask:
+                    bit = mask & -mask
+                    row, col = divmod(bit.bit_length() - 1, self.n)
+                    rects.append(QRect(xs[col], ys[row], sq, sq))
+                    mask ^= bit
+            painter.setPen(Qt.NoPen)
+            for color, rects in zip(guide_colors, color_rects):
+                if rects:
+                    painter.setBrush(color)
+                    painter.drawRects(rects)
         else:
             # Single clash color - avoids brown when 3+ queens overlap
             clash_color = QColor(255, 120, 120, 160)  # Light coral red
-            clash_squares = set()
-            for q1, q2 in self.attacking_pairs:
-                clash_squares.add(q1)
-                clash_squares.add(q2)
-            for row, col in clash_squares:
-                x = margin_x + col * square_size
-                y = margin_y + row * square_size
-                painter.fillRect(int(x), int(y), int(square_size), int(square_size), clash_color)
+            clash_mask = 0  # Bit row * n + col set for every clashing square
+            for (r1, c1), (r2, c2) in self.attacking_pairs:
+                clash_mask |= 1 << (r1 * self.n + c1)
+                clash_mask |= 1 << (r2 * self.n + c2)
+            # Collect every clashing square into one path and fill it in a single call
+            clash_path = QPainterPath()
+            clash_path.setFillRule(Qt.WindingFill)
+            while clash_mask:
+                bit = clash_mask & -clash_mask
+                row, col = divmod(bit.bit_length() - 1, self.n)
+                clash_path.addRect(xs[col], ys[row], sq, sq)
+                clash_mask ^= bit
+            if not clash_path.isEmpty():
+                painter.fillPath(clash_path, clash_color)
         
         # Draw queens
-        font = QFont("Arial", int(square_size * 0.6))
-        painter.setFont(font)
-        painter.setPen(QColor(0, 0, 0))  # Black outline
-        
         for row, col in self.queens:
             # Draw queen at original position (even if dragging, show faded)
-            x = margin_x + col * square_size + square_size / 2
-            y = margin_y + row * square_size + square_size / 2
-            
-            # If this queen is being dragged, draw it faded
             if self.dragging_queen == (row, col):
-                painter.setPen(QColor(0, 0, 0, 100))
-                painter.setBrush(QColor(255, 255, 255, 100))
+                painter.drawPixmap(xs[col], ys[row], self._queen_pix_faded)
             else:
-                painter.setPen(QColor(0, 0, 0))
-                painter.setBrush(QColor(255, 255, 255))
-                
-            painter.drawText(int(x - square_size/2), int(y - square_size/2), 
-                           int(square_size), int(square_size), 
-                           Qt.AlignCenter, "♛")
+                painter.drawPixmap(xs[col], ys[row], self._queen_pix)
         
         # Draw dragging queen at mouse position
         if self.dragging_queen and self.drag_current_pos:
-            x = self.drag_start_pos.x()
-            y = self.drag_start_pos.y()
-            painter.setPen(QColor(0, 0, 0))
-            painter.setBrush(QColor(255, 255, 255))
-            painter.drawText(int(x - square_size/2), int(y - square_size/2), 
-                           int(square_size), int(square_size), 
-                           Qt.AlignCenter, "♛")
+            x = self.drag_current_pos.x()
+            y = self.drag_current_pos.y()
+            painter.drawPixmap(x - sq // 2, y - sq // 2, self._queen_pix)
 
 
-class NQueenSolver:
+class SolveWorker(QObject):
+    """Runs the N-Queen search away from the GUI thread"""
+    
+    finished = Signal(object)  # List of ('+'/'-', row, col) steps
+    
+    def __init__(self, n, record_search=False):
+        super().__init__()
+        self.n = n
+        self.record_search = record_search
+        
+    @Slot()
+    def run(self):
+        """Search for a solution and emit the steps to animate"""
+        # Steps are recorded as deltas: ('+', row, col) places a queen and
+        # ('-', row, col) takes it back off
+        if self.record_search:
+            steps = search_steps(self.n)
+        else:
+            steps = [('+', row, col) for row, col in enumerate(first_solution(self.n))]
+        self.finished.emit(steps)
+
+
+class NQueenSolver(QObject):
     """N-Queen solver with step-by-step animation support"""
     
     def __init__(self, n, board_widget, speed=6):
+        super().__init__()
         self.n = n
         self.board = board_widget
         self.speed = speed  # 1-10, where 10 is instant
@@ -277,40 +424,67 @@ class NQueenSolver:
         self.current_step = 0
         self.solving = False
         
-    def solve(self, callback=None):
-        """Solve N-Queen problem with backtracking"""
+        # One repeating timer drives the whole animation, see animateSolution
+        self._anim_timer = QTimer(self)
+        self._anim_timer.setTimerType(Qt.CoarseTimer)  # Frame-level precision is plenty
+        self._anim_timer.timeout.connect(self.showNextStep)
+        self._anim_callback = None
+        self._solve_callback = None
+        self._thread = None
+        self._worker = None
+        
+    def solve(self, callback=None, record_search=False):
+        """Solve N-Queen problem and animate the result.
+        
+        By default only the solution is animated, row by row. With
+        record_search=True every placement and backtrack of the search is
+        replayed instead. The search runs on a worker thread so the window
+        stays responsive; the animation starts once it reports back.
+        """
         self.solution_steps = []
         self.current_step = 0
         self.solving = True
-        
-        def backtrack(row, queens):
-            if row == self.n:
-                # Found a solution
-                self.solution_steps.append(list(queens))
-                return True
-                
-            for col in range(self.n):
-                # Check if placing queen at (row, col) is valid
-                valid = True
-                for r, c in queens:
-                    if c == col or abs(r - row) == abs(c - col):
-                        valid = False
-                        break
-                        
-                if valid:
-                    queens.append((row, col))
-                    self.solution_steps.append(list(queens))
-                    
-                    if backtrack(row + 1, queens):
-                        return True
-                        
-                    queens.pop()
-                    self.solution_steps.append(list(queens))
-                    
-            return False
+        self._solve_callback = callback
+        
+        self._thread = QThread(self)
+        self._worker = SolveWorker(self.n, record_search)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.finished.connect(self.onSearchFinished)
+        self._worker.finished.connect(self._thread.quit)
+        # Drop our references first, then let Qt free both objects
+        self._thread.finished.connect(self.onThreadFinished)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.finished.connect(self._thread.deleteLater)
+        self._thread.start()
+        
+    def stop(self, wait=False):
+        """Abandon the search result and any running animation.
+        
+        With wait=True also blocks until the worker thread has exited, so it
+        is not destroyed while still running (e.g. on window close).
+        """
+        self._anim_timer.stop()
+        self.solving = False
+        if wait and self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
             
-        backtrack(0, [])
-        self.animateSolution(callback)
+    @Slot()
+    def onThreadFinished(self):
+        """Forget the worker thread once it has exited (GUI thread)"""
+        self._thread = None
+        self._worker = None
+        
+    @Slot(object)
+    def onSearchFinished(self, steps):
+        """Start animating the steps found by the worker (GUI thread)"""
+        if not self.solving or self.n != self.board.n:
+            # Stopped, or the board was resized, while the worker was searching
+            self.solving = False
+            return
+        self.solution_steps = steps
+        self.animateSolution(self._solve_callback)
         
     def animateSolution(self, callback=None):
         """Animate the solution steps"""
@@ -321,24 +495,27 @@ class NQueenSolver:
             
         delay_ms = int((10 - self.speed) * 100)  # Speed 6 = 400ms delay
         
-        def showStep(step_idx):
-            if step_idx < len(self.solution_steps):
-                self.board.clearQueens()
-                for queen in self.solution_steps[step_idx]:
-                    self.board.placeQueen(queen[0], queen[1])
-                    
-                if step_idx < len(self.solution_steps) - 1:
-                    QTimer.singleShot(delay_ms, lambda: showStep(step_idx + 1))
-                else:
-                    self.solving = False
-                    if callback:
-                        callback(True)
-            else:
-                self.solving = False
-                if callback:
-                    callback(True)
-                    
-        showStep(0)
+        self._anim_callback = callback
+        self.current_step = 0
+        self.board.clearQueens()
+        self.showNextStep()
+        if self.current_step < len(self.solution_steps):
+            self._anim_timer.start(delay_ms)
+            
+    def showNextStep(self):
+        """Apply the next recorded step to the board"""
+        op, row, col = self.solution_steps[self.current_step]
+        if op == '+':
+            self.board.placeQueen(row, col)
+        else:
+            self.board.removeQueen(row, col)
+            
+        self.current_step += 1
+        if self.current_step >= len(self.solution_steps):
+            self._anim_timer.stop()
+            self.solving = False
+            if self._anim_callback:
+                self._anim_callback(True)
 
 
 class MainWindow(QMainWindow):
@@ -407,6 +584,10 @@ class MainWindow(QMainWindow):
         
     def onNChanged(self, n):
         """Handle N value change"""
+        if self.solver and self.solver.solving:
+            # The steps were computed for the old N and no longer fit the board
+            self.solver.stop()
+            self.setSolvingControls(False)
         self.board.setN(n)
         self.status_label.setText(f"Board size changed to {n}x{n}")
         
@@ -416,19 +597,34 @@ class MainWindow(QMainWindow):
             return
             
         self.status_label.setText("Solving...")
-        self.solve_btn.setEnabled(False)
+        self.setSolvingControls(True)
         
         self.solver = NQueenSolver(self.board.n, self.board, speed=6)
         self.solver.solve(callback=self.onSolveComplete)
         
     def onSolveComplete(self, success):
         """Handle solve completion"""
-        self.solve_btn.setEnabled(True)
+        self.setSolvingControls(False)
         if success:
             self.status_label.setText("Solution found!")
         else:
             self.status_label.setText("No solution found")
             
+    def setSolvingControls(self, solving):
+        """Lock everything that changes the board while the solver animates it"""
+        # The animation applies its steps on top of the current board, and
+        # the steps are only valid for the N they were computed for
+        self.solve_btn.setEnabled(not solving)
+        self.n_spinbox.setEnabled(not solving)
+        self.make_puzzle_btn.setEnabled(not solving)
+        self.board.setEnabled(not solving)  # Blocks dragging queens
+        
+    def closeEvent(self, event):
+        """Stop the solver and its worker thread before closing"""
+        if self.solver:
+            self.solver.stop(wait=True)
+        super().closeEvent(event)
+        
     def onMakePuzzle(self):
         """Handle Make Puzzle button - randomly place queens"""
         self.board.randomPlaceQueens()
@@ -0,0 +1,81 @@
+"""Qt-free N-Queen search kernels used by the GUI solver"""
+
+from typing import List, Optional, Tuple
+
+try:
+    import numba
+except ImportError:  # Numba is optional; the solver then runs as plain Python
+    numba = None  # type: ignore[assignment]
+
+
+Step = Tuple[str, int, int]
+
+
+def _search(n: int, steps: Optional[List[Step]]) -> List[int]:
+    """Find the first N-Queen solution by bitmask backtracking.
+    
+    Returns the column of the queen in each row, or an empty list if there
+    is no solution. Uses an explicit stack instead of recursion so that it
+    can be compiled with Numba. If steps is a list, every queen placed and
+    taken back is appended to it as a ('+', row, col) or ('-', row, col) step;
+    the compiled copy is only ever called with None, which Numba prunes away.
+    """
+    mask = (1 << n) - 1
+    queens = [0] * n  # Column chosen in each row
+    free = [0] * n  # Columns still to be tried in each row
+    cols = [0] * (n + 1)
+    diag1 = [0] * (n + 1)
+    diag2 = [0] * (n + 1)
+    
+    row = 0
+    # Mirroring a solution left-right moves the first queen to column n-1-c,
+    # so only the left half of the first row needs to be searched
+    free[0] = (1 << ((n + 1) // 2)) - 1
+    while row >= 0:
+        if row == n:
+            return queens
+        if free[row] == 0:
+            # Every column in this row failed, take back the queen above
+            row -= 1
+            if steps is not None:
+                if row >= 0:
+                    steps.append(('-', row, queens[row]))
+            continue
+            
+        p = free[row] & -free[row]  # Lowest free column
+        free[row] ^= p
+        # Numba has no int.bit_length, so find the column by shifting
+        col = 0
+        while (p >> col) != 1:
+            col += 1
+        queens[row] = col
+        if steps is not None:
+            steps.append(('+', row, col))
+        
+        cols[row + 1] = cols[row] | p
+        diag1[row + 1] = (diag1[row] | p) << 1
+        diag2[row + 1] = (diag2[row] | p) >> 1
+        row += 1
+        if row < n:
+            free[row] = ~(cols[row] | diag1[row] | diag2[row]) & mask
+            
+    return queens[:0]
+
+
+_first_solution = _search
+# Numba compiles from Python bytecode, so a mypyc-built copy of this module
+# (see README) is left as is. nogil lets the search run in parallel with the GUI thread
+if numba is not None and __file__.endswith(".py"):
+    _first_solution = numba.njit(cache=True, nogil=True)(_search)
+
+
+def first_solution(n: int) -> List[int]:
+    """Return the column of the queen in each row of the first solution, or []"""
+    return _first_solution(n, None)
+
+
+def search_steps(n: int) -> List[Step]:
+    """Record every queen placed and taken back on the way to the first solution"""
+    steps: List[Step] = []
+    _search(n, steps)
+    return steps